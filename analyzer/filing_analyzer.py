@@ -47,6 +47,8 @@ def add_new_filings_to_chat(company_symbol, new_filings):
     logging.info("Saving conversation history to database..")
     upsert_conversation(conn, company_symbol, conversation_history)
 
+    return conversation_history
+
 
 def add_filing_to_chat(new_filing, conversation_history):
     logging.info(f"Analyzing new filing..")
@@ -46,49 +46,74 @@ def download_htm_documents_for_symbol(symbol: str, no_of_entries: int = 10):
     with open(f"{output_dir}/{NEW_FILINGS_FILENAME}", "w", encoding="utf-8") as f:
         json.dump(new_filings_json, f, indent=4)
 
-def download_documents_from_index(index_url: str, output_dir: str, new_filings_json):
-    """Parses the index URL and downloads .htm documents listed in its table."""
+def download_documents_from_index(index_url: str, output_dir: str, new_filings_json, timeout=None, include_existing=False) -> bool:
+    """
+    Parses the index URL and downloads .htm documents listed in its table.
+    Returns False if the index page or any of its documents failed to download.
+    """
     try:
-        r = requests.get(index_url, headers={"User-Agent": EDGAR_USER_AGENT})
+        r = requests.get(index_url, headers={"User-Agent": EDGAR_USER_AGENT}, timeout=timeout)
         r.raise_for_status()
         doc = html.fromstring(r.content)
     except Exception as e:
         logging.info(f"Failed to process index page: {index_url} — {e}")
-        return
+        return False
 
+    success = True
     for link in doc.xpath('//table[@class="tableFile"]//a'):
         href = link.get("href")
 
         if href and EDGAR_DOC_PATTERN.match(href):
             full_url = urljoin(BASE_URL, href)
-            download_single_htm_file(full_url, output_dir, new_filings_json)
+            if not download_single_htm_file(full_url, output_dir, new_filings_json, timeout, include_existing):
+                success = False
 
+    return success
 
-def download_single_htm_file(full_url: str, output_dir: str, new_filings_json):
-    """Downloads and saves a single .htm file from EDGAR."""
+
+def download_single_htm_file(full_url: str, output_dir: str, new_filings_json, timeout=None, include_existing=False) -> bool:
+    """
+    Downloads and saves a single .htm file from EDGAR.
+    If include_existing is set, files already on disk are read back into new_filings_json instead of being skipped.
+    Returns False if the download failed.
+    """
     parsed = urlparse(full_url)
     filename = parsed.path.strip("/").replace("/", "_")
     local_path = os.path.join(output_dir, filename)
 
     if os.path.exists(local_path):
+        if include_existing:
+            try:
+                with open(local_path, "r", encoding="utf-8", errors="replace") as f:
+                    new_filings_json[filename] = extract_filing_text(f.read())
+            except Exception as e:
+                logging.info(f"Failed to read {local_path} — {e}")
+                return False
+            logging.info(f"{full_url} EXISTS, READ FROM DISK..")
+            return True
         logging.info(f"{full_url} EXISTS, SKIPPING..")
-        return
+        return True
 
     try:
-        r = requests.get(full_url, headers={"User-Agent": EDGAR_USER_AGENT})
+        r = requests.get(full_url, headers={"User-Agent": EDGAR_USER_AGENT}, timeout=timeout)
         r.raise_for_status()
 
-        truncated_content: str = extract_text_before_marker(r.text)
-
-        doc = html.fromstring(truncated_content)
-        text_content = doc.text_content()
-        new_filings_json[filename] = text_content
+        new_filings_json[filename] = extract_filing_text(r.text)
 
         with open(local_path, "wb") as f:
             f.write(r.content)
         logging.info(f"Saved: {local_path}")
+        return True
     except Exception as e:
         logging.info(f"Failed to download {full_url} — {e}")
+        return False
+
+def extract_filing_text(raw_filing_text: str) -> str:
+    """Returns the plain text of a raw filing, truncated before the first page marker."""
+    truncated_content: str = extract_text_before_marker(raw_filing_text)
+
+    doc = html.fromstring(truncated_content)
+    return doc.text_content()
 
 def extract_text_before_marker(raw_filing_text: str, marker_pattern: str = r"<!-- Field: Page; Sequence: \d+ -->") -> str:
     """
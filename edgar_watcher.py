@@ -0,0 +1,287 @@
+import json
+import os
+import re
+import sys
+import time
+import logging
+from urllib.parse import urlparse
+
+import requests
+from lxml import etree
+
+from sec_utils import EDGAR_USER_AGENT
+from edgar_files_fetcher import BASE_OUTPUT_DIR, NEW_FILINGS_FILENAME, download_documents_from_index
+from analyzer.filing_analyzer import add_new_filings_to_chat
+
+FEED_PAGE_SIZE = 100
+EDGAR_CURRENT_FEED_URL = f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&output=atom&count={FEED_PAGE_SIZE}"
+WATCHLIST_PATH = "data/filtered_stocks.json"
+ANALYZED_FILINGS_FILENAME = "analyzed_accessions.json"
+POLL_INTERVAL_SEC = 60
+FETCH_TIMEOUT = 10
+MAX_FEED_PAGES = 10
+MAX_RETRIES = 4
+
+ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+# Feed entry titles look like "6-K - Cuprina Holdings (Cayman) Ltd (0001995704) (Filer)"
+ENTRY_CIK_PATTERN = re.compile(r"\((\d{10})\)")
+ACCESSION_PATTERN = re.compile(r"accession-number=(\d{10}-\d{2}-\d{6})")
+
+
+def load_watchlist(path: str = WATCHLIST_PATH) -> dict:
+    """
+    Loads the filtered stocks json and returns a dict: { cik (int): symbol }
+    When several tickers share a CIK (e.g. MAYA, MAYAU, MAYAR) the base ticker is used, which is the
+    shortest one since unit / rights / warrant tickers add a suffix to it.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        stocks = json.load(f)
+
+    watchlist = {}
+    for stock in stocks:
+        if not stock.get("cik"):
+            continue
+
+        cik = int(stock["cik"])
+        symbol = stock["symbol"]
+        if cik not in watchlist or (len(symbol), symbol) < (len(watchlist[cik]), watchlist[cik]):
+            watchlist[cik] = symbol
+
+    return watchlist
+
+
+def is_url(source: str) -> bool:
+    return urlparse(source).scheme in ("http", "https")
+
+
+def fetch_feed(source: str, validators: dict, start: int = 0):
+    """
+    Fetches a page of the feed from a URL or a local replay file.
+    Returns (raw feed bytes, new validators), or (None, validators) if it has not changed since the last poll.
+    Validators (ETag / Last-Modified, or file mtime) are only sent for the first page.
+    """
+    if not is_url(source):
+        mtime = os.path.getmtime(source)
+        if validators.get("mtime") == mtime:
+            return None, validators
+        with open(source, "rb") as f:
+            return f.read(), {"mtime": mtime}
+
+    headers = {"User-Agent": EDGAR_USER_AGENT}
+    if start:
+        separator = "&" if urlparse(source).query else "?"
+        source = f"{source}{separator}start={start}"
+    else:
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    r = requests.get(source, headers=headers, timeout=FETCH_TIMEOUT)
+    if r.status_code == 304:
+        return None, validators
+    r.raise_for_status()
+
+    new_validators = {}
+    if "ETag" in r.headers:
+        new_validators["etag"] = r.headers["ETag"]
+    if "Last-Modified" in r.headers:
+        new_validators["last_modified"] = r.headers["Last-Modified"]
+
+    return r.content, new_validators
+
+
+def fetch_new_entries(source: str, validators: dict, seen: set):
+    """
+    Fetches and parses the feed, paging back until an already seen entry is reached.
+    Returns (entries, new validators), or (None, validators) if the feed has not changed.
+    """
+    feed_content, new_validators = fetch_feed(source, validators)
+    if feed_content is None:
+        return None, validators
+
+    entries = parse_feed_entries(feed_content)
+    keys = {(entry["accession"], entry["cik"]) for entry in entries}
+
+    page = 1
+    while seen and not keys & seen and is_url(source) and page < MAX_FEED_PAGES:
+        logging.info(f"No previously seen filing on feed page {page}, fetching next page..")
+        page_content, _ = fetch_feed(source, validators, start=page * FEED_PAGE_SIZE)
+        page_entries = [entry for entry in parse_feed_entries(page_content)
+                        if (entry["accession"], entry["cik"]) not in keys]
+        if not page_entries:
+            break
+
+        entries += page_entries
+        keys |= {(entry["accession"], entry["cik"]) for entry in page_entries}
+        page += 1
+
+    if seen and not keys & seen:
+        logging.warning(f"No previously seen filing in the last {len(entries)} feed entries, some filings may have been missed")
+
+    return entries, new_validators
+
+
+def parse_feed_entries(feed_content: bytes) -> list:
+    """
+    Parses the EDGAR current filings Atom feed.
+    Returns a list of dicts: { accession, cik, form_type, index_url }
+    """
+    root = etree.fromstring(feed_content)
+
+    entries = []
+    for entry in root.xpath("//atom:entry", namespaces=ATOM_NS):
+        title = entry.findtext("atom:title", default="", namespaces=ATOM_NS)
+        entry_id = entry.findtext("atom:id", default="", namespaces=ATOM_NS)
+        category = entry.find("atom:category", namespaces=ATOM_NS)
+        link = entry.find("atom:link", namespaces=ATOM_NS)
+
+        cik_match = ENTRY_CIK_PATTERN.search(title)
+        accession_match = ACCESSION_PATTERN.search(entry_id)
+        if not cik_match or not accession_match or link is None:
+            continue
+
+        entries.append({
+            "accession": accession_match.group(1),
+            "cik": int(cik_match.group(1)),
+            "form_type": category.get("term") if category is not None else title.split(" - ")[0],
+            "index_url": link.get("href"),
+        })
+
+    return entries
+
+
+def load_analyzed_accessions(output_dir: str) -> set:
+    path = os.path.join(output_dir, ANALYZED_FILINGS_FILENAME)
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, "r", encoding="utf-8") as f:
+        return set(json.load(f))
+
+
+def save_analyzed_accession(output_dir: str, accession: str):
+    analyzed = load_analyzed_accessions(output_dir)
+    analyzed.add(accession)
+
+    with open(os.path.join(output_dir, ANALYZED_FILINGS_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(sorted(analyzed), f, indent=4)
+
+
+def get_last_response_text(conversation_history: list) -> str:
+    """Returns the text of the last model response in a conversation history."""
+    content = conversation_history[-1]["content"] if conversation_history else ""
+    if isinstance(content, list):
+        return " ".join(getattr(part, "text", None) or str(part) for part in content)
+    return str(content)
+
+
+def process_filing(symbol: str, entry: dict, include_existing: bool = False) -> bool:
+    """
+    Downloads the documents of a single new filing and runs them through the analyzer.
+    include_existing should only be set when retrying, so documents already handled by the batch flow are not analyzed twice.
+    Returns False if the download failed, the filing is then left unanalyzed so it can be retried.
+    """
+    output_dir = os.path.join(BASE_OUTPUT_DIR, symbol.upper())
+    os.makedirs(output_dir, exist_ok=True)
+
+    if entry["accession"] in load_analyzed_accessions(output_dir):
+        logging.info(f"{entry['accession']} for {symbol} already analyzed, skipping..")
+        return True
+
+    logging.info(f"New {entry['form_type']} filing for {symbol}: {entry['accession']}")
+
+    new_filings_json = {}
+    if not download_documents_from_index(entry["index_url"], output_dir, new_filings_json,
+                                         timeout=FETCH_TIMEOUT, include_existing=include_existing):
+        return False
+
+    if new_filings_json:
+        with open(f"{output_dir}/{NEW_FILINGS_FILENAME}", "w", encoding="utf-8") as f:
+            json.dump(new_filings_json, f, indent=4)
+
+        conversation_history = add_new_filings_to_chat(symbol, list(new_filings_json.values()))
+        logging.info(f"Risk assessment for {symbol} ({entry['accession']}): {get_last_response_text(conversation_history)}")
+    else:
+        logging.info(f"No documents to analyze in {entry['accession']} for {symbol}")
+
+    save_analyzed_accession(output_dir, entry["accession"])
+    return True
+
+
+def poll_once(source: str, watchlist: dict, validators: dict, seen: set, pending: dict) -> set:
+    """
+    Polls the feed once, queues new watchlist filings in pending and processes everything pending.
+    Filings stay in pending until they are analyzed, or dropped after MAX_RETRIES failed attempts.
+    Returns the set of (accession, cik) keys currently in the feed, to be passed as seen on the next poll.
+    """
+    try:
+        entries, new_validators = fetch_new_entries(source, validators, seen)
+        if entries is None:
+            logging.debug("Feed not modified")
+    except Exception as e:
+        # Pending retries still run below, seen and validators are kept for the next poll
+        logging.info(f"Failed to poll {source}: {e}")
+        entries = None
+
+    if entries is not None:
+        for entry in entries:
+            key = (entry["accession"], entry["cik"])
+            symbol = watchlist.get(entry["cik"])
+            if symbol is not None and key not in seen:
+                pending.setdefault(key, {"symbol": symbol, "entry": entry, "attempts": 0})
+
+        # The feed parsed fine, so it is safe to send its validators from now on
+        validators.clear()
+        validators.update(new_validators)
+
+        # Entries only leave the feed once they are older than everything in it, so this keeps seen bounded
+        seen = {(entry["accession"], entry["cik"]) for entry in entries}
+
+    for key, item in list(pending.items()):
+        symbol, entry = item["symbol"], item["entry"]
+        try:
+            # Documents left on disk by a previous failed attempt are read back so they still get analyzed
+            success = process_filing(symbol, entry, include_existing=item["attempts"] > 0)
+        except Exception as e:
+            logging.info(f"Failed to process {entry['accession']} for {symbol}: {e}")
+            success = False
+
+        if success:
+            del pending[key]
+            continue
+
+        item["attempts"] += 1
+        if item["attempts"] >= MAX_RETRIES:
+            logging.error(f"Giving up on {entry['accession']} for {symbol} after {MAX_RETRIES} attempts.")
+            del pending[key]
+        else:
+            logging.info(f"Will retry {entry['accession']} for {symbol} on the next poll..")
+
+    return seen
+
+
+def run_watcher(source: str = EDGAR_CURRENT_FEED_URL, poll_interval: int = POLL_INTERVAL_SEC):
+    """Polls the EDGAR current filings feed forever and analyzes new filings of watchlist companies."""
+    watchlist = load_watchlist()
+    logging.info(f"Watching {len(watchlist)} companies on {source}")
+
+    validators = {}
+    seen = set()
+    pending = {}
+    while True:
+        try:
+            seen = poll_once(source, watchlist, validators, seen, pending)
+        except Exception as e:
+            logging.info(f"Failed to poll {source}: {e}")
+
+        time.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,  # Enable INFO level and above
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    # Optional argument: feed URL or path to a locally saved feed to replay
+    run_watcher(sys.argv[1] if len(sys.argv) > 1 else EDGAR_CURRENT_FEED_URL)